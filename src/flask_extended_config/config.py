@@ -25,15 +25,23 @@ import os
 import sys
 import errno
 import copy
-import json
+import re
 import datetime
+from collections import deque
 from flask import Config as BaseConfig
 from mako.template import Template
 from mako.exceptions import text_error_template
-import io
-from flask_extended_config.iterator import lookahead
-from flask_extended_config.sqlalchemy_url import SqlalchemyUrl
-from flask_extended_config.yaml_load import my_safe_load
+from flask_extended_config.yaml_load import my_safe_load, scan_includes
+from flask_extended_config.config_cache import cache_filename, load_cache, store_cache
+
+try:
+    import orjson
+
+    def _json_load( stream: t.IO[ t.Any ] ) -> t.Any:
+        return orjson.loads( stream.read() )
+
+except ImportError:
+    from json import load as _json_load
 
 
 __author__ = "Marc Bertens"
@@ -45,6 +53,97 @@ __all__ = [ 'Config' ]
 """
 
 
+# Compiled Mako templates by source string, compiling is the expensive part of rendering.
+_TEMPLATE_CACHE: dict[ str, Template ] = {}
+
+# Configuration keys that may hold a timedelta as 'days=1,hours=2'
+_DELTA_KEYS = frozenset( ( "PERMANENT_SESSION_LIFETIME",
+                           "SEND_FILE_MAX_AGE_DEFAULT",
+                           "JWT_ACCESS_TOKEN_EXPIRES",
+                           "JWT_REFRESH_TOKEN_EXPIRES" ) )
+_DELTA_RE = re.compile( r'\s*(\w+)\s*=\s*(-?\d+)\s*' )
+
+# Value types that Config.dump() writes as nested block, with the prefix for the items.
+# Looked up by exact type, configuration values are plain dicts and lists.
+_DUMP_NESTED = { dict: '', list: '-' }
+
+
+def _delta_settings( value: str ) -> dict[ str, int ]:
+    """Convert the string 'days=1,hours=2' to the keyword arguments for a timedelta.
+
+    :param value:
+    :return:
+    :raises ValueError: when a setting is not of the form name=integer.
+    """
+    settings = {}
+    for setting in value.split( ',' ):
+        match = _DELTA_RE.fullmatch( setting )
+        if match is None:
+            raise ValueError( f"Invalid timedelta setting '{ setting }' in '{ value }'" )
+
+        settings[ match.group( 1 ) ] = int( match.group( 2 ) )
+
+    return settings
+
+
+def _has_templates( node: dict ) -> bool:
+    """Check if any string value, at any level, contains a Mako expression '${'.
+
+    :param node:
+    :return:            True at the first string value found with a '${'.
+    """
+    stack = [ node ]
+    while stack:
+        # Plain dict access, the scan shall not create the lazy keys of the Config.
+        for value in dict.values( stack.pop() ):
+            if isinstance( value, str ):
+                if '${' in value:
+                    return True
+
+            elif isinstance( value, dict ):
+                stack.append( value )
+
+    return False
+
+
+def _resolve_dotted( root: dict, dotted_key: str, value: t.Any ) -> None:
+    """Set the value of a dotted key, 'SECTION.SUB.KEY', in the root dictionary.
+
+    :param root:
+    :param dotted_key:
+    :param value:
+    :return:
+    """
+    parts = dotted_key.split( '.' )
+    node = root
+    for part in parts[ :-1 ]:
+        node = node[ part ]
+
+    node[ parts[ -1 ] ] = value
+    return
+
+
+def _resolve_key( path: dict, upd: dict, root: dict ) -> dict:
+    """Override the keys in path with the keys from upd, dotted keys are resolved from the root.
+
+    :param path:
+    :param upd:
+    :param root:
+    :return:            the path dictionary.
+    """
+    for key, value in upd.items():
+        if '.' in key:
+            _resolve_dotted( root, key, value )
+
+        elif isinstance( value, dict ) and key in path:
+            path[ key ] = _resolve_key( path[ key ], value, root )
+
+        else:
+            path[ key ] = value
+
+    return path
+
+
 class Config( BaseConfig ):
     """Flask config enhanced with a `from_yaml`, `from_json` and from_folder' methods.
 
@@ -64,7 +163,11 @@ class Config( BaseConfig ):
         PASSWORD:   the password used to authenticate with the database
         OPTIONS:    extra options for the connection
 
-    when 'SQLALCHEMY_DATABASE_URI' is not present in the configuration, 'DATABASE' is used.
+    when 'SQLALCHEMY_DATABASE_URI' is not present in the configuration, it is created from 'DATABASE'
+    on first access: indexing, get(), setdefault(), pop(), len(), ==, repr() and any iteration of the
+    configuration (keys(), items(), values(), copy(), dict(config), struct, get_namespace() and dump()).
+    When 'DATABASE' cannot be converted all of these raise a ValueError naming 'DATABASE'. The 'in'
+    operator reports the key as present without creating it.
     """
     def __init__( self, root_path: str | os.PathLike[str], defaults: t.Optional[ dict[str, t.Any] ] = None,
                   env_name: t.Optional[ str ] = 'FLASK_ENV', task_name: t.Optional[ str ] = 'FLASK_TASK' ) -> None:
@@ -82,49 +185,187 @@ class Config( BaseConfig ):
         self.__task_name    = task_name
         return
 
+    def _section_names( self ) -> tuple[ str, str ]:
+        """Internal function that reads the environment and task section names from the environment variables.
+
+        :return:            the environment and task section names.
+        """
+        return os.environ.get( self.__environ_name, 'DEVELOPMENT' ), os.environ.get( self.__task_name, 'webapp' )
+
+    def _resolve_lazy( self, key: str ) -> bool:
+        """Internal function that creates 'SQLALCHEMY_DATABASE_URI' from 'DATABASE' on first access.
+
+        :param key:
+        :return:            True when the key was created.
+        :raises ValueError: when the 'DATABASE' section cannot be converted.
+        """
+        if key != 'SQLALCHEMY_DATABASE_URI' or super().__contains__( key ) or not super().__contains__( 'DATABASE' ):
+            return False
+
+        from flask_extended_config.sqlalchemy_url import SqlalchemyUrl
+        try:
+            url = SqlalchemyUrl.from_config_dict( self[ 'DATABASE' ] )
+
+        except ( KeyError, TypeError, ValueError ) as exc:
+            raise ValueError( f"Cannot create 'SQLALCHEMY_DATABASE_URI' from 'DATABASE': {exc!r}" ) from exc
+
+        self[ key ] = url
+        return True
+
+    def __missing__( self, key: str ) -> t.Any:
+        if self._resolve_lazy( key ):
+            return self[ key ]
+
+        raise KeyError( key )
+
+    def __contains__( self, key: object ) -> bool:
+        # Does not create the key, so that a malformed 'DATABASE' only fails on access.
+        return super().__contains__( key ) or ( key == 'SQLALCHEMY_DATABASE_URI' and super().__contains__( 'DATABASE' ) )
+
+    def __iter__( self ) -> t.Iterator[ str ]:
+        self._resolve_lazy( 'SQLALCHEMY_DATABASE_URI' )
+        return super().__iter__()
+
+    def __len__( self ) -> int:
+        self._resolve_lazy( 'SQLALCHEMY_DATABASE_URI' )
+        return super().__len__()
+
+    def __repr__( self ) -> str:
+        self._resolve_lazy( 'SQLALCHEMY_DATABASE_URI' )
+        return super().__repr__()
+
+    def __eq__( self, other: object ) -> bool:
+        self._resolve_lazy( 'SQLALCHEMY_DATABASE_URI' )
+        if isinstance( other, Config ):
+            other._resolve_lazy( 'SQLALCHEMY_DATABASE_URI' )
+
+        return super().__eq__( other )
+
+    def __ne__( self, other: object ) -> bool:
+        result = self.__eq__( other )
+        return result if result is NotImplemented else not result
+
+    def keys( self ) -> t.KeysView[ str ]:
+        self._resolve_lazy( 'SQLALCHEMY_DATABASE_URI' )
+        return super().keys()
+
+    def items( self ) -> t.ItemsView[ str, t.Any ]:
+        self._resolve_lazy( 'SQLALCHEMY_DATABASE_URI' )
+        return super().items()
+
+    def values( self ) -> t.ValuesView[ t.Any ]:
+        self._resolve_lazy( 'SQLALCHEMY_DATABASE_URI' )
+        return super().values()
+
+    def copy( self ) -> dict:
+        self._resolve_lazy( 'SQLALCHEMY_DATABASE_URI' )
+        return super().copy()
+
+    def get( self, key: str, default: t.Any = None ) -> t.Any:
+        self._resolve_lazy( key )
+        return super().get( key, default )
+
+    def setdefault( self, key: str, default: t.Any = None ) -> t.Any:
+        self._resolve_lazy( key )
+        return super().setdefault( key, default )
+
+    def pop( self, key: str, *default: t.Any ) -> t.Any:
+        self._resolve_lazy( key )
+        return super().pop( key, *default )
+
     def _config_over_ride( self, result: dict, override: dict ) -> dict:
         """Internal function that overrides the keys in 'override' to the dictionary result
 
+        Dictionaries from 'override' that are adopted as a new key are copied, a document
+        may alias the same dictionary under several keys.
+
         :param result:      source / target dictionary.
         :param override:    holds the keys to be overridden in the source dictionary.
         :return:            the result dictionary.
         """
-        for key, value in override.items():
-            if isinstance( value, dict ):
-                if key not in result:
-                    result[ key ] = copy.copy( value )
+        stack = deque( [ ( result, override ) ] )
+        while stack:
+            target, source = stack.pop()
+            if not ( target.keys() & source.keys() ):
+                # No overlapping keys, nothing to merge
+                target.update( { key: copy.copy( value ) if isinstance( value, dict ) else value
+                                 for key, value in source.items() } )
+                continue
+
+            for key, value in source.items():
+                current = target.get( key )
+                if isinstance( value, dict ):
+                    if isinstance( current, dict ):
+                        stack.append( ( current, value ) )
 
-                else:
-                    result[ key ] = self._config_over_ride( result[ key ], value )
+                    else:
+                        target[ key ] = copy.copy( value )
 
-            else:
-                result[ key ] = value
+                else:
+                    target[ key ] = value
 
         return result
 
-    def _config_inject( self, result: dict, folder: str, environ_var: str, target: str, default_section: str ) -> dict:
-        """
+    @staticmethod
+    def _scan_folder( folder: str ) -> t.Optional[ dict[ str, os.DirEntry ] ]:
+        """Internal function that lists the folder once, so that files can be looked up without stat calls.
 
-        :param result:
         :param folder:
-        :param environ_var:
-        :param target:
-        :param default_section:
-        :return:
+        :return:            dictionary with the filename and os.DirEntry, None when the folder is not present.
         """
-        section_name = os.environ.get( environ_var, default_section )
-        if os.path.isdir( folder ):
-            configFile = os.path.join( folder, '{}.conf'.format( section_name ) )
-            if os.path.isfile( configFile ):
-                with open( configFile, 'r' ) as stream:
-                    result = self._config_over_ride( result, my_safe_load( stream ) )
+        try:
+            with os.scandir( folder ) as iterator:
+                return { entry.name: entry for entry in iterator }
 
-            else:
-                print( f"No {target} config for {environ_var}", file=sys.stderr)
+        except OSError:
+            return None
 
-        else:
+    @staticmethod
+    def _folder_file( entries: t.Optional[ dict[ str, os.DirEntry ] ], filename: str ) -> t.Optional[ os.DirEntry ]:
+        """Internal function that looks up a file in the result of _scan_folder()
+
+        :param entries:
+        :param filename:
+        :return:            the os.DirEntry of the file, None when not present.
+        """
+        entry = entries.get( filename ) if entries is not None else None
+        return entry if entry is not None and entry.is_file() else None
+
+    def _section_file( self, entries: t.Optional[ dict[ str, os.DirEntry ] ], environ_var: str,
+                       target: str, section_name: str ) -> t.Optional[ os.DirEntry ]:
+        """Internal function that looks up the section configuration file, and reports when it is missing.
+
+        :param entries:         the entries of the section folder, see _scan_folder()
+        :param environ_var:
+        :param target:
+        :param section_name:    the section name, from the environment variable environ_var.
+        :return:                the os.DirEntry of the section file, None when not present.
+        """
+        if entries is None:
             # no custom configurations at all.
             print( f"No 'environ' folder for {section_name} configuration", file=sys.stderr)
+            return None
+
+        entry = self._folder_file( entries, f'{ section_name }.conf' )
+        if entry is None:
+            print( f"No {target} config for {environ_var}", file=sys.stderr)
+
+        return entry
+
+    def _config_inject( self, result: dict, entry: t.Optional[ os.DirEntry ], target: str, section_name: str,
+                        fresh: bool = False ) -> dict:
+        """
+
+        :param result:
+        :param entry:           the section configuration file, see _section_file()
+        :param target:
+        :param section_name:    the section name, from the environment variable.
+        :param fresh:           bypass the in-process parse cache of my_safe_load().
+        :return:
+        """
+        if entry is not None:
+            with open( entry.path, 'r' ) as stream:
+                result = self._config_over_ride( result, my_safe_load( stream, master = False if fresh else None ) )
 
         if target == 'ENV':
             result[ 'ENVIRONMENT' ] = section_name
@@ -133,7 +374,7 @@ class Config( BaseConfig ):
         return result
 
     def from_folder( self, config_folder: str = None, env_name: t.Optional[ str ] = None,
-                     task_name: t.Optional[ str ] = None ) -> bool:
+                     task_name: t.Optional[ str ] = None, cache: bool = False ) -> bool:
         """First the config/config.yal is loaded as the master configuration.
 
         Second in sub-folder config/env is checked that a <{FLASK_ENV}>.yaml is located,
@@ -142,9 +383,15 @@ class Config( BaseConfig ):
         Third in sub-folder config/tsk is checked that a <{FLASK_TASK}>.yaml is located,
         If so it loaded and the attributes from this file are overriding the config.
 
+        When cache is True the merged configuration is cached in config/.cache, as long as
+        none of the contributing files change the cache is used instead of loading the YAML
+        files. The cache is a pickle, only enable it when the configuration folder can only be
+        written by the user running the application. Remove config/.cache to clear the cache.
+
         :param config_folder:
         :param env_name:
         :param task_name:
+        :param cache:           use the persistent cache in config/.cache, disabled by default.
 
         :return:
         """
@@ -157,39 +404,40 @@ class Config( BaseConfig ):
         if not isinstance( config_folder, str ):
             config_folder = os.path.join( self.root_path, 'config' )
 
+        env_value, task_value = self._section_names()
         try:
-            if os.path.isdir( config_folder ):
+            entries = self._scan_folder( config_folder )
+            if entries is not None:
                 # Master configuration
-                configFile = os.path.join( config_folder, 'config.conf' )
-                if os.path.isfile( configFile ):
-                    with open( configFile, 'r' ) as stream:
-                        result = my_safe_load( stream )
+                configFile = self._folder_file( entries, 'config.conf' )
+                if configFile is None:
+                    raise Exception( 'No master configuration present {}'.format(
+                                                    os.path.join( config_folder, 'config.conf' ) ) )
+
+                hosts_name  = f'{ platform.node() }.conf'
+                hosts       = self._scan_folder( os.path.join( config_folder, 'hosts' ) )
+                environ     = self._scan_folder( os.path.join( config_folder, 'environ' ) )
+                tasks       = self._scan_folder( os.path.join( config_folder, 'tasks' ) )
+                hosts_file  = self._folder_file( hosts, hosts_name )
+                environ_file = self._section_file( environ, self.__environ_name, 'ENV', env_value )
+                tasks_file  = self._section_file( tasks, self.__task_name, 'TASK', task_value )
+                # Missing files are part of the cache key by name, creating them invalidates the cache.
+                sources = [ configFile,
+                            hosts_file or os.path.join( config_folder, 'hosts', hosts_name ),
+                            environ_file or os.path.join( config_folder, 'environ', f'{ env_value }.conf' ),
+                            tasks_file or os.path.join( config_folder, 'tasks', f'{ task_value }.conf' ) ]
+                if cache:
+                    includes = scan_includes( *[ source.path for source in sources if isinstance( source, os.DirEntry ) ] )
+                    cache_file = cache_filename( config_folder, sources, includes )
+                    result = load_cache( cache_file )
+                    if result is None:
+                        result, depends = self._load_folder( configFile.path, hosts_file, environ_file, tasks_file,
+                                                             env_value, task_value, fresh = True )
+                        store_cache( cache_file, result, depends )
 
                 else:
-                    raise Exception( 'No master configuration present {}'.format( configFile ) )
-
-                for key in ( "LOGGING", ):
-                    # Check of the item is a string, the file exists and ends with .json or .yaml
-                    if isinstance( result[ key ], str ) and result[ key ].lower().endswith( ( '.json', '.conf', '.yaml' ) ):
-                        filepath = os.path.abspath( os.path.join( self.root_path, result[ key ] ) )
-                        if os.path.exists( filepath ):
-                            # This needs to be loaded
-                            with open( filepath, 'r' ) as stream:
-                                if result[key].lower().endswith('.json' ):
-                                    result[ key ] = json.load( stream )
-
-                                else:
-                                    result[ key ] = my_safe_load( stream )
-
-                hosts_folder = os.path.join( config_folder, 'hosts', f'{ platform.node() }.conf' )
-                if os.path.exists( hosts_folder ):
-                    with open(hosts_folder, 'r') as stream:
-                        result = self._config_over_ride( result, my_safe_load(stream ) )
-
-                self._config_inject( result, os.path.join( config_folder, 'environ' ),
-                                    self.__environ_name, 'ENV', 'DEVELOPMENT' )
-                self._config_inject( result, os.path.join( config_folder, 'tasks' ),
-                                    self.__task_name, 'TASK', 'webapp' )
+                    result, _ = self._load_folder( configFile.path, hosts_file, environ_file, tasks_file,
+                                                   env_value, task_value )
 
             else:
                 raise Exception( "Configuration folder not present: {}".format( config_folder ) )
@@ -200,6 +448,49 @@ class Config( BaseConfig ):
             print( traceback.format_exc() )
             raise
 
+    def _load_folder( self, configFile: str, hosts_file: t.Optional[ os.DirEntry ],
+                      environ_file: t.Optional[ os.DirEntry ],
+                      tasks_file: t.Optional[ os.DirEntry ], env_value: str, task_value: str,
+                      fresh: bool = False ) -> tuple[ dict, list ]:
+        """Internal function that loads and merges the configuration files from the folder.
+
+        :param configFile:      the master configuration file.
+        :param hosts_file:      the host specific configuration file, None when not present.
+        :param environ_file:    the environment section configuration file, None when not present.
+        :param tasks_file:      the task section configuration file, None when not present.
+        :param env_value:       the environment section name.
+        :param task_value:      the task section name.
+        :param fresh:           bypass the in-process parse cache of my_safe_load(), used when
+                                the result is stored in the persistent cache.
+        :return:                the configuration and the list of additional files that were loaded.
+        """
+        depends = []
+        master = False if fresh else None
+        with open( configFile, 'r' ) as stream:
+            result = my_safe_load( stream, master = master )
+
+        for key in ( "LOGGING", ):
+            # Check of the item is a string, the file exists and ends with .json or .yaml
+            if isinstance( result[ key ], str ) and result[ key ].lower().endswith( ( '.json', '.conf', '.yaml' ) ):
+                filepath = os.path.abspath( os.path.join( self.root_path, result[ key ] ) )
+                depends.append( filepath )
+                if os.path.exists( filepath ):
+                    # This needs to be loaded
+                    with open( filepath, 'r' ) as stream:
+                        if result[key].lower().endswith('.json' ):
+                            result[ key ] = _json_load( stream )
+
+                        else:
+                            result[ key ] = my_safe_load( stream, master = master )
+
+        if hosts_file is not None:
+            with open( hosts_file.path, 'r' ) as stream:
+                result = self._config_over_ride( result, my_safe_load( stream, master = master ) )
+
+        self._config_inject( result, environ_file, 'ENV', env_value, fresh )
+        self._config_inject( result, tasks_file, 'TASK', task_value, fresh )
+        return result, depends
+
     def from_file( self, filename: str | os.PathLike[str],
                          load: t.Callable[[t.IO[t.Any]], t.Mapping[str, t.Any]],
                          silent: bool = False,
@@ -241,7 +532,8 @@ class Config( BaseConfig ):
                                 ``False`` otherwise.
         """
         # Get the Flask environment variable, if not exist assume development.
-        env = os.environ.get( self.__environ_name, 'DEVELOPMENT' ).upper()
+        env, task_value = self._section_names()
+        env = env.upper()
         self[ 'ENVIRONMENT' ] = env.lower()
         try:
             with open( config_file ) as f:
@@ -254,7 +546,7 @@ class Config( BaseConfig ):
             e.strerror = 'Unable to load configuration file (%s)' % e.strerror
             raise
 
-        task_section = c.get( 'COMMON_TASKS', {} ).get( os.environ.get( self.__task_name, 'webapp' ), {} )
+        task_section = c.get( 'COMMON_TASKS', {} ).get( task_value, {} )
         return self._modify( c.get( env, c ), task_section )
 
     def from_json( self, config_file: str | os.PathLike[ str ], silent: bool = False ) -> bool:
@@ -270,11 +562,11 @@ class Config( BaseConfig ):
         """
 
         # Get the Flask environment variable, if not exist assume development.
-        env = os.environ.get( self.__environ_name, 'DEVELOPMENT' )
+        env, task_value = self._section_names()
         self[ 'ENVIRONMENT' ] = env.lower()
         try:
             with open( config_file ) as f:
-                c = json.load( f )
+                c = _json_load( f )
 
         except IOError as e:
             if silent and e.errno in (errno.ENOENT, errno.EISDIR):
@@ -284,18 +576,15 @@ class Config( BaseConfig ):
             raise
 
         # Get the environment segment
-        segment = copy.copy( c.get( env, c ) )
+        segment = c.get( env, c )
         # self.__dump( segment )
         if 'inport' in segment:
-            # Get the import segment
-            c = copy.copy( c.get( segment[ 'inport' ], {} ) )
             # join the selected segment and imported segment, making sure that
             # the selected segment has priority over the imported segment
-            c.update( segment )
-            segment = c
+            c = segment = { **c.get( segment[ 'inport' ], {} ), **segment }
 
         if 'COMMON_TASKS' in c:
-            task_section = c.get( 'COMMON_TASKS', {} ).get( os.environ.get( self.__task_name, 'webapp' ), {} )
+            task_section = c.get( 'COMMON_TASKS', {} ).get( task_value, {} )
 
         else:
             task_section = {}
@@ -303,22 +592,40 @@ class Config( BaseConfig ):
         return self._modify( segment, task_section )
 
     def _resolve_variables( self, node: dict ) -> None:
-        """
+        """Render all string values containing '${' as Mako template, with the configuration as context.
 
         :param node:
         :return:
         """
-        for key, value in node.items():
-            if isinstance( value, str ):
-                if '${' in value:
-                    try:
-                        node[ key ] = Template( value ).render( **dict( self ) )
+        # Plain dict access, resolving variables shall not create the lazy keys.
+        render_ctx = dict( dict.items( self ) )
+        # Depth-first in document order, a nested dictionary is resolved at the point it is met.
+        stack = [ ( node, iter( dict.items( node ) ) ) ]
+        while stack:
+            current, items = stack[ -1 ]
+            for key, value in items:
+                if isinstance( value, str ):
+                    if '${' in value:
+                        template = _TEMPLATE_CACHE.get( value )
+                        if template is None:
+                            template = _TEMPLATE_CACHE.setdefault( value, Template( value ) )
 
-                    except:
-                        raise Exception( text_error_template().render() )
+                        try:
+                            current[ key ] = template.render( **render_ctx )
 
-            elif isinstance( value, dict ):
-                self._resolve_variables( value )
+                        except:
+                            raise Exception( text_error_template().render() )
+
+                        if current is self:
+                            # Keep the context in sync with the resolved top-level value
+                            render_ctx[ key ] = current[ key ]
+
+                elif isinstance( value, dict ):
+                    stack.append( ( value, iter( dict.items( value ) ) ) )
+                    break
+
+            else:
+                stack.pop()
 
         return
 
@@ -329,118 +636,70 @@ class Config( BaseConfig ):
         :param task_section:
         :return:
         """
-        delta_keys = ( "PERMANENT_SESSION_LIFETIME",
-                       "SEND_FILE_MAX_AGE_DEFAULT",
-                       "JWT_ACCESS_TOKEN_EXPIRES",
-                       "JWT_REFRESH_TOKEN_EXPIRES" )
-
         if isinstance( task_section, dict ):
-            def resolve_keys( path, keys, value ):
-                for key, more in lookahead( keys ):
-                    if more:
-                        path = path[ key ]
-
-                    else:
-                        path[ key ] = value
-                        return
-
-                return
-
-            def resolve_key( path, upd ):
-                for key, value in  upd.items():
-                    if '.' in key:
-                        resolve_keys( c, key.split( '.' ), value )
-
-                    elif isinstance( value, dict ):
-                        if key in path:
-                            path[ key ] = resolve_key( path[ key ], value )
-
-                        else:
-                            path[ key ] = value
-
-                    else:
-                        path[ key ] = value
-
-                return path
-
             try:
-                resolve_key( c, task_section )
+                _resolve_key( c, task_section, c )
 
             except Exception:
                 logging.getLogger().exception( "Resolving the config failed" )
                 raise
 
-        for key in c.keys():
-            if key.isupper():
-                # Is the variable '**PATH**' in the name and starts with a dot.
-                if "PATH" in key and c[ key ].startswith( '.' ):
-                    # Resolve the path to a full path
-                    self[ key ] = os.path.abspath( os.path.join( self.root_path, c[ key ] ) )
-
-                else:
-                    def func( value ):
-                        try:
-                            return int( value )
-
-                        except Exception as exc:        # noqa
-                            pass
+        for key, value in c.items():
+            if not key.isupper():
+                continue
 
-                        return value
+            # Is the variable '**PATH**' in the name and starts with a dot.
+            if "PATH" in key and isinstance( value, str ) and value.startswith( '.' ):
+                # Resolve the path to a full path
+                self[ key ] = os.path.abspath( os.path.join( self.root_path, value ) )
 
-                    if key in delta_keys:
-                        if '=' in c[ key ]:
-                            # convert the string to a dict.
-                            settings = dict( map( func, x.split( '=' ) ) for x in c[ key ].split( ',' ) )
-                            self[ key ] = datetime.timedelta( **settings )
+            elif key in _DELTA_KEYS and isinstance( value, str ) and '=' in value:
+                # convert the string 'days=1,hours=2' to a timedelta.
+                self[ key ] = datetime.timedelta( **_delta_settings( value ) )
 
-                        else:
-                            self[ key ] = c[ key ]
-
-                    else:
-                        self[ key ] = c[ key ]
+            else:
+                self[ key ] = value
 
-        self._resolve_variables( self )
-        if 'DATABASE' in self and 'SQLALCHEMY_DATABASE_URI' not in self:
-            self[ 'SQLALCHEMY_DATABASE_URI' ] = SqlalchemyUrl.from_config_dict( self[ 'DATABASE' ] )
+        # Templates may also come from the defaults, from_mapping(), from_object() or assignment.
+        if _has_templates( self ):
+            self._resolve_variables( self )
 
         self.dump()
         return True
 
     def dump( self ) -> None:
-        if os.environ.get( 'FLASK_DEBUG', 0 ) == 0 and self.get( 'DEBUG', 0 ) == 0:
+        """Dump the configuration to the 'webapp' logger at INFO level, when FLASK_DEBUG or DEBUG is set.
+
+        :return:
+        """
+        flask_debug = os.environ.get( 'FLASK_DEBUG', '0' )
+        if flask_debug.lower() in ( '', '0', 'false', 'no' ) and not self.get( 'DEBUG' ):
             return
 
         logger = logging.getLogger( 'webapp' )
-        logger.setLevel( "INFO" )
-        with io.StringIO() as stream:
-            self._dumper( dict( self ), stream )
-            stream.seek( 0, 0 )
-            if stream:
-                print( f"Configuration:\n{ stream.getvalue() } " )
-
-            else:
-                logger.info( f"Configuration:\n{ stream.getvalue() } " )
+        if not logger.isEnabledFor( logging.INFO ):
+            return
 
+        parts = []
+        self._dumper( dict( self ), parts )
+        logger.info( f"Configuration:\n{ ''.join( parts ) } " )
         return
 
     @property
     def struct( self ) -> dict:
         return dict( self )
 
-    def _dumper( self, node: t.Union[ dict, list ], stream: io.IOBase, indent: int = 0, prefix: str = '', value_column: int = 35 ) -> None:
+    def _dumper( self, node: t.Union[ dict, list ], parts: list[ str ], indent: int = 0, prefix: str = '', value_column: int = 35 ) -> None:
         if isinstance( node, dict ):
             indent_str = ' ' * indent
             offset = value_column - indent
             for key, value in node.items():
-                if isinstance( value, dict ):
-                    stream.write( f"{indent_str}{key:{offset}s} :\n" )
-                    self._dumper( value, stream, indent + 4 )
-
-                elif isinstance( value, list ):
-                    stream.write( f"{indent_str}{key:{offset}s} :\n" )
-                    self._dumper( value, stream, indent + 4, prefix= '-' )
+                nested_prefix = _DUMP_NESTED.get( type( value ) )
+                if nested_prefix is not None:
+                    parts.append( f"{indent_str}{key:{offset}s} :\n" )
+                    self._dumper( value, parts, indent + 4, prefix = nested_prefix )
 
                 else:
-                    stream.write( f"{indent_str}{ prefix }{key:{offset}s} : { str( value ) }\n" )
+                    parts.append( f"{indent_str}{ prefix }{key:{offset}s} : { str( value ) }\n" )
 
         return
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+#
+# Flask Extended Config extension for Flask framework
+#
+# Copyright (C) 2018-2025 Marc Bertens-Nguyen <m.bertens@pe2mbs.nl>
+#
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Library General Public License GPL-2.0-only
+# as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+import typing as t
+import os
+import glob
+import stat
+import hashlib
+import pickle
+from importlib import metadata
+
+
+"""Pickled cache of the merged configuration, stored in the '.cache' sub-folder
+of the configuration folder. The cache filename is a hash of the filenames,
+modification times and sizes of all the files that contributed to the configuration.
+
+The cache is unpickled, therefore it shall only be enabled when the configuration folder
+is trusted; only cache files owned by the current user that are not writable by group
+or others are loaded. The cache files hold the merged configuration, including secrets,
+and are only readable by the current user.
+"""
+
+
+CACHE_FOLDER = '.cache'
+
+try:
+    _VERSION = metadata.version( 'Flask-extended-config' )
+
+except metadata.PackageNotFoundError:
+    _VERSION = 'unknown'
+
+
+def file_stamp( filename: t.Union[ str, os.DirEntry ] ) -> tuple:
+    """Get the stamp of a file, missing files get a stamp too so that creating them invalidates the cache.
+
+    :param filename:    the filename, or the os.DirEntry of the file which may hold the stat result already.
+    :return:            tuple with filename, modification time in nanoseconds and size.
+    """
+    entry = filename if isinstance( filename, os.DirEntry ) else None
+    if entry is not None:
+        filename = entry.path
+
+    try:
+        st = entry.stat() if entry is not None else os.stat( filename )
+
+    except OSError:
+        return filename, None, None
+
+    return filename, st.st_mtime_ns, st.st_size
+
+
+def _digest( value: t.Any ) -> str:
+    return hashlib.blake2b( repr( ( _VERSION, value ) ).encode( 'utf-8' ), digest_size = 16 ).hexdigest()
+
+
+def cache_filename( config_folder: str, sources: t.Iterable[ t.Union[ str, os.DirEntry ] ],
+                    includes: t.Iterable[ str ] = () ) -> str:
+    """The cache filename is '<sources hash>-<stamps hash>.pkl', both include the package version.
+    The first part identifies the selected configuration (host, environment and task), the second
+    part its content.
+
+    :param config_folder:   the configuration folder.
+    :param sources:         the top-level files that (may) contribute to the configuration.
+    :param includes:        the files included by the sources.
+    :return:                the filename of the cache file.
+    """
+    stamps = [ file_stamp( filename ) for filename in sources ]
+    selection = _digest( [ stamp[ 0 ] for stamp in stamps ] )
+    content = _digest( stamps + [ file_stamp( filename ) for filename in includes ] )
+    return os.path.join( config_folder, CACHE_FOLDER, f'{ selection }-{ content }.pkl' )
+
+
+def _is_trusted( filename: str ) -> bool:
+    """Check that the file is owned by the current user and not writable by group or others.
+
+    :param filename:
+    :return:
+    """
+    st = os.stat( filename )
+    if hasattr( os, 'getuid' ) and st.st_uid != os.getuid():
+        return False
+
+    return not st.st_mode & ( stat.S_IWGRP | stat.S_IWOTH )
+
+
+def load_cache( filename: str ) -> t.Optional[ dict ]:
+    """Load the configuration from the cache file.
+
+    :param filename:    the filename of the cache file.
+    :return:            the configuration, or None when not present, not trusted or stale.
+    """
+    try:
+        if not ( _is_trusted( os.path.dirname( filename ) ) and _is_trusted( filename ) ):
+            return None
+
+        with open( filename, 'rb' ) as stream:
+            payload = pickle.load( stream )
+
+    except Exception:       # noqa
+        # Missing, unreadable or corrupt, the configuration needs to be loaded.
+        return None
+
+    for stamp in payload[ 'depends' ]:
+        if file_stamp( stamp[ 0 ] ) != stamp:
+            return None
+
+    return payload[ 'config' ]
+
+
+def store_cache( filename: str, config: dict, depends: t.Iterable[ str ] = () ) -> None:
+    """Store the configuration in the cache file, failing to do so is silently ignored.
+    The previous cache files of the same configuration selection are removed.
+
+    :param filename:    the filename of the cache file.
+    :param config:      the configuration.
+    :param depends:     additional files that were found while loading the configuration.
+    :return:
+    """
+    payload = { 'depends': [ file_stamp( depend ) for depend in depends ], 'config': config }
+    temp_filename = f'{ filename }.{ os.getpid() }'
+    try:
+        os.makedirs( os.path.dirname( filename ), mode = 0o700, exist_ok = True )
+        with os.fdopen( os.open( temp_filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600 ), 'wb' ) as stream:
+            pickle.dump( payload, stream, protocol = pickle.HIGHEST_PROTOCOL )
+
+        # Atomic replace, other worker processes may be reading the cache.
+        os.replace( temp_filename, filename )
+
+    except Exception:       # noqa
+        try:
+            os.remove( temp_filename )
+
+        except OSError:
+            pass
+
+        return
+
+    selection = os.path.basename( filename ).split( '-' )[ 0 ]
+    for stale in glob.glob( os.path.join( os.path.dirname( filename ), f'{ selection }-*.pkl' ) ):
+        if stale != filename:
+            try:
+                os.remove( stale )
+
+            except OSError:
+                pass
+
+    return
@@ -1,5 +1,20 @@
+import typing as t
 import yaml
 import os.path
+import re
+import stat
+import io
+import copy
+import functools
+import threading
+from flask_extended_config.config_cache import file_stamp
+
+try:
+    # libyaml based loader, falls back to the pure Python loader when not available.
+    from yaml import CSafeLoader as _Loader
+
+except ImportError:
+    from yaml import SafeLoader as _Loader
 
 
 def my_compose_document( self ):
@@ -15,9 +30,93 @@ def my_compose_document( self ):
     return node
 
 
+# The C loader composes the document in libyaml, therefore it cannot share the anchors
+# with the including document. my_safe_load() falls back to the SafeLoader when needed.
 yaml.SafeLoader.compose_document = my_compose_document
 
 
+_INCLUDE_RE = re.compile( r'!include\s+(\S+)' )
+
+
+def _include_path( filename: str, value: str ) -> str:
+    """Resolve the !include value, relative names are resolved from the folder of filename.
+
+    :param filename:    the filename of the including document.
+    :param value:       the value of the !include tag.
+    :return:            the absolute filename of the included document.
+    """
+    if value.startswith( '.' ):
+        value = os.path.join( os.path.dirname( filename ), value )
+
+    return os.path.abspath( value )
+
+
+def _find_includes( filename: str, text: str ) -> list:
+    """Find the !include tags in the document text without parsing it.
+
+    :param filename:    the filename of the document.
+    :param text:        the text of the document.
+    :return:            the absolute filenames of the included documents.
+    """
+    return [ _include_path( filename, value.strip( '\'"' ) ) for value in _INCLUDE_RE.findall( text ) ]
+
+
+# The texts of the top-level document being parsed and its included documents, read ahead
+# while building the cache key.
+_PREFETCHED = threading.local()
+
+
+def _read_text( filename: str ) -> t.Optional[ str ]:
+    """
+
+    :param filename:
+    :return:            the text of the file, None when it could not be read.
+    """
+    try:
+        with open( filename, 'r' ) as stream:
+            return stream.read()
+
+    except OSError:
+        return None
+
+
+def _read_includes( filename: str, text: str ) -> dict:
+    """Read the included documents of the document, recursively, without parsing them.
+
+    :param filename:    the filename of the top-level document.
+    :param text:        the text of the top-level document.
+    :return:            dictionary with the absolute filename and text of the included documents,
+                        the text is None when the file could not be read.
+    """
+    texts = {}
+    pending = _find_includes( filename, text )
+    while pending:
+        include_name = pending.pop()
+        if include_name in texts:
+            continue
+
+        include_text = texts[ include_name ] = _read_text( include_name )
+        if include_text is not None:
+            pending.extend( _find_includes( include_name, include_text ) )
+
+    return texts
+
+
+def scan_includes( *filenames: str ) -> list:
+    """Scan the documents for !include tags without parsing them, this is done recursively.
+
+    :param filenames:   the filenames of the top-level documents, missing files are skipped.
+    :return:            the absolute filenames of all included documents.
+    """
+    found = {}
+    for filename in filenames:
+        text = _read_text( filename )
+        if text is not None:
+            found.update( _read_includes( filename, text ) )
+
+    return list( found )
+
+
 def yaml_include( loader, node ):
     """
 
@@ -25,22 +124,131 @@ def yaml_include( loader, node ):
     :param node:
     :return:
     """
-    if node.value.startswith( '.' ):
-        include_name = os.path.join( os.path.dirname( node.start_mark.name ), node.value )
+    include_name = _include_path( node.start_mark.name, node.value )
+    if include_name in loader.include_memo:
+        # Diamond include, the document was already parsed for this top-level document.
+        return copy.deepcopy( loader.include_memo[ include_name ] )
 
-    else:
-        include_name = node.value
+    if include_name in loader.include_stack:
+        raise yaml.constructor.ConstructorError( None, None, f"found recursive !include of '{ include_name }'",
+                                                 node.start_mark )
+
+    loader.include_stack.append( include_name )
+    try:
+        text = getattr( _PREFETCHED, 'files', {} ).get( include_name )
+        if text is not None:
+            data = my_safe_load( _named_stream( text, include_name ), Loader = type( loader ), master = loader )
+
+        else:
+            with open( include_name, 'r' ) as input_file:
+                data = my_safe_load( input_file, Loader = type( loader ), master = loader )
+
+    finally:
+        loader.include_stack.pop()
 
-    include_name = os.path.abspath( include_name )
-    with open( include_name, 'r' ) as input_file:
-        data = my_safe_load( input_file, master = loader )
-        return data
+    loader.include_memo[ include_name ] = data
+    return data
 
 
 yaml.add_constructor( "!include", yaml_include, Loader = yaml.SafeLoader )
+if _Loader is not yaml.SafeLoader:
+    yaml.add_constructor( "!include", yaml_include, Loader = _Loader )
 
 
-def my_safe_load( stream, Loader = yaml.SafeLoader, master = None ) -> dict:            # noqa
+@functools.lru_cache( maxsize = 128 )
+def _parse_cached( path: str, stamps: tuple, Loader = _Loader ) -> dict:     # noqa
+    """Parse the YAML file, the result is cached on the path and the stamps of the file and its includes.
+
+    :param path:        absolute path of the YAML file.
+    :param stamps:      the file_stamp() of the YAML file and all its !include files,
+                        only used as part of the cache key.
+    :param Loader:
+    :return:            the parsed data, this shall not be modified by the caller.
+    """
+    # The texts were already read by my_safe_load() to build the stamps.
+    text, includes = _PREFETCHED.source
+    return _parse( text, path, Loader, includes )
+
+
+def my_safe_load( stream, Loader = _Loader, master = None ) -> dict:            # noqa
+    """
+
+    :param stream:
+    :param Loader:
+    :param master:      the loader of the including document, False to bypass the cache.
+    :return:
+    """
+    if master is None:
+        # Top-level documents from real files are served from the cache, anchors
+        # only need to be shared during the parse of the document itself.
+        filename = getattr( stream, 'name', None )
+        try:
+            st = os.fstat( stream.fileno() )
+
+        except ( AttributeError, OSError, ValueError ):
+            st = None
+
+        if isinstance( filename, str ) and st is not None and stat.S_ISREG( st.st_mode ):
+            filename = os.path.abspath( filename )
+            text = stream.read()
+            includes = _read_includes( filename, text )
+            stamps = ( ( filename, st.st_mtime_ns, st.st_size ), ) + \
+                     tuple( file_stamp( include_name ) for include_name in includes )
+            _PREFETCHED.source = ( text, includes )
+            try:
+                return copy.deepcopy( _parse_cached( filename, stamps, Loader ) )
+
+            finally:
+                _PREFETCHED.source = None
+
+    if master:
+        return _load( stream, Loader, master )
+
+    name = getattr( stream, 'name', '<file>' )
+    text = stream.read()
+    return _parse( text, name, Loader, _read_includes( name, text ) )
+
+
+def _parse( text: str, name: str, Loader, includes: dict ) -> dict:     # noqa
+    """Parse the top-level document.
+
+    :param text:        the text of the document.
+    :param name:        the name of the document, used to resolve relative !include values.
+    :param Loader:
+    :param includes:    the texts of the included documents, see _read_includes()
+    :return:
+    """
+    previous = getattr( _PREFETCHED, 'files', None )
+    _PREFETCHED.files = includes
+    try:
+        if Loader is _Loader and _Loader is not yaml.SafeLoader:
+            # Aliases to anchors of the including document are only supported by the
+            # SafeLoader, in that case the document is parsed again using the SafeLoader.
+            try:
+                return _load( _named_stream( text, name ), Loader )
+
+            except yaml.composer.ComposerError:
+                return _load( _named_stream( text, name ), yaml.SafeLoader )
+
+        return _load( _named_stream( text, name ), Loader )
+
+    finally:
+        _PREFETCHED.files = previous
+
+
+def _named_stream( text: str, name: str ) -> io.StringIO:
+    """
+
+    :param text:
+    :param name:    the name of the stream, used to resolve relative !include values.
+    :return:
+    """
+    stream = io.StringIO( text )
+    stream.name = name
+    return stream
+
+
+def _load( stream, Loader, master = None ) -> dict:      # noqa
     """
 
     :param stream:
@@ -49,9 +257,19 @@ def my_safe_load( stream, Loader = yaml.SafeLoader, master = None ) -> dict:
     :return:
     """
     loader = Loader( stream )
-    if master is not None:
+    if hasattr( master, 'anchors' ):
         loader.anchors = master.anchors
 
+    if master:
+        # Shared with the including document, for the whole top-level document.
+        loader.include_memo = master.include_memo
+        loader.include_stack = master.include_stack
+
+    else:
+        name = getattr( stream, 'name', '<file>' )
+        loader.include_memo = {}
+        loader.include_stack = [ os.path.abspath( name ) ] if not name.startswith( '<' ) else []
+
     try:
         return loader.get_single_data()
 
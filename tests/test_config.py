@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+#
+# Flask Extended Config extension for Flask framework
+#
+# Copyright (C) 2018-2025 Marc Bertens-Nguyen <m.bertens@pe2mbs.nl>
+#
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Library General Public License GPL-2.0-only
+# as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+import datetime
+import pytest
+from flask_extended_config.config import Config
+
+
+@pytest.mark.parametrize( 'value, expected', [
+    ( "days=1,hours=2", datetime.timedelta( days = 1, hours = 2 ) ),
+    ( "days = 1 , seconds=-5", datetime.timedelta( days = 1, seconds = -5 ) ),
+] )
+def test_delta_keys_are_converted( tmp_path, value, expected ):
+    config = Config( str( tmp_path ) )
+    config._modify( { 'PERMANENT_SESSION_LIFETIME': value } )
+    assert config[ 'PERMANENT_SESSION_LIFETIME' ] == expected
+
+
+@pytest.mark.parametrize( 'value', [ "days=abc", "days=1.5", "days=1,", "days=1;hours=2" ] )
+def test_invalid_delta_keys_raise( tmp_path, value ):
+    config = Config( str( tmp_path ) )
+    with pytest.raises( ValueError ):
+        config._modify( { 'PERMANENT_SESSION_LIFETIME': value } )
+
+
+def test_dump_is_logged_at_info( tmp_path, monkeypatch, caplog, capsys ):
+    monkeypatch.setenv( 'FLASK_DEBUG', '1' )
+    config = Config( str( tmp_path ) )
+    with caplog.at_level( 'INFO', logger = 'webapp' ):
+        config._modify( { 'NAME': 'app' } )
+
+    assert 'NAME' in caplog.text
+    assert capsys.readouterr().out == ''
+
+
+def test_dump_is_skipped_when_logger_is_disabled( tmp_path, monkeypatch ):
+    monkeypatch.setenv( 'FLASK_DEBUG', '1' )
+    config = Config( str( tmp_path ) )
+    monkeypatch.setattr( config, '_dumper', lambda *args, **kwargs: pytest.fail( "dumper called" ) )
+    config._modify( { 'NAME': 'app' } )
+
+
+def test_environment_is_read_when_loading( tmp_path, monkeypatch ):
+    monkeypatch.delenv( 'FLASK_ENV', raising = False )
+    config_file = tmp_path / 'config.conf'
+    config_file.write_text( "DEVELOPMENT:\n  NAME: dev\nPRODUCTION:\n  NAME: prod\n" )
+    config = Config( str( tmp_path ) )
+    monkeypatch.setenv( 'FLASK_ENV', 'PRODUCTION' )
+    config.from_yaml( str( config_file ) )
+    assert config[ 'NAME' ] == 'prod'
+
+
+@pytest.fixture
+def database_config( tmp_path ):
+    config = Config( str( tmp_path ) )
+    config._modify( { 'DATABASE': { 'ENGINE': 'sqlite', 'DATABASE': '/tmp/test.sqlite' } } )
+    return config
+
+
+def test_database_uri_is_in_struct( database_config ):
+    assert 'SQLALCHEMY_DATABASE_URI' in database_config.struct
+
+
+def test_database_uri_is_in_namespace( database_config ):
+    assert 'database_uri' in database_config.get_namespace( 'SQLALCHEMY_' )
+
+
+@pytest.mark.parametrize( 'view', [ 'keys', 'items', 'values', 'copy' ] )
+def test_database_uri_is_created_by_views( database_config, view ):
+    result = getattr( database_config, view )()
+    assert str( dict.__getitem__( database_config, 'SQLALCHEMY_DATABASE_URI' ) ) == 'sqlite:////tmp/test.sqlite'
+    assert len( result ) == 2
+
+
+def test_database_uri_contains_has_no_side_effect( tmp_path ):
+    config = Config( str( tmp_path ) )
+    config._modify( { 'DATABASE': { 'DATABASE': 'missing engine' } } )
+    assert 'SQLALCHEMY_DATABASE_URI' in config
+    assert not dict.__contains__( config, 'SQLALCHEMY_DATABASE_URI' )
+
+
+def test_database_uri_and_len_agree( database_config ):
+    assert len( database_config ) == len( database_config.keys() ) == 2
+    assert database_config.get( 'SQLALCHEMY_DATABASE_URI', 'default' ) == database_config[ 'SQLALCHEMY_DATABASE_URI' ]
+    assert database_config == dict( database_config )
+
+
+@pytest.mark.parametrize( 'access', [
+    lambda config: config[ 'SQLALCHEMY_DATABASE_URI' ],
+    lambda config: config.get( 'SQLALCHEMY_DATABASE_URI', 'default' ),
+    lambda config: config.pop( 'SQLALCHEMY_DATABASE_URI', 'default' ),
+    len,
+    repr,
+    dict,
+    lambda config: config.keys(),
+    lambda config: config == {},
+] )
+def test_invalid_database_raises_value_error( tmp_path, access ):
+    config = Config( str( tmp_path ) )
+    config._modify( { 'DATABASE': { 'DATABASE': 'missing engine' } } )
+    with pytest.raises( ValueError, match = 'DATABASE' ):
+        access( config )
+
+
+def test_database_uri_is_not_created_while_loading( tmp_path ):
+    config = Config( str( tmp_path ) )
+    config._modify( { 'NAME': 'app', 'TITLE': '${NAME}', 'DATABASE': { 'DATABASE': 'missing engine' } } )
+    assert config[ 'TITLE' ] == 'app'
+    assert not dict.__contains__( config, 'SQLALCHEMY_DATABASE_URI' )
+
+
+def test_variables_are_resolved_in_document_order( tmp_path ):
+    config = Config( str( tmp_path ) )
+    config._modify( { 'NAME': 'app', 'SUB': { 'X': '${NAME}-x' }, 'TOP': '${SUB["X"]}!' } )
+    assert config[ 'SUB' ] == { 'X': 'app-x' }
+    assert config[ 'TOP' ] == 'app-x!'
+
+
+def test_variables_from_defaults_are_resolved( tmp_path ):
+    config = Config( str( tmp_path ), defaults = { 'URL': 'http://${HOST}/' } )
+    config._modify( { 'HOST': 'example' } )
+    assert config[ 'URL' ] == 'http://example/'
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+#
+# Flask Extended Config extension for Flask framework
+#
+# Copyright (C) 2018-2025 Marc Bertens-Nguyen <m.bertens@pe2mbs.nl>
+#
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Library General Public License GPL-2.0-only
+# as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+import os
+import stat
+import pickle
+import pytest
+from flask_extended_config.config import Config
+from flask_extended_config.yaml_load import _parse_cached
+
+
+@pytest.fixture
+def config_folder( tmp_path, monkeypatch ):
+    monkeypatch.delenv( 'FLASK_ENV', raising = False )
+    monkeypatch.delenv( 'FLASK_TASK', raising = False )
+    monkeypatch.delenv( 'FLASK_DEBUG', raising = False )
+    folder = tmp_path / 'config'
+    ( folder / 'inc' ).mkdir( parents = True )
+    ( folder / 'config.conf' ).write_text( "LOGGING: {}\nCOMMON: !include ./inc/common.conf\n" )
+    ( folder / 'inc' / 'common.conf' ).write_text( "C: 1\n" )
+    return folder
+
+
+def _edit( filename, text ):
+    # Make sure the stamp changes, even on file systems with a coarse modification time.
+    st = os.stat( filename )
+    filename.write_text( text )
+    os.utime( filename, ns = ( st.st_atime_ns, st.st_mtime_ns + 1_000_000_000 ) )
+
+
+def test_edited_include_is_not_cached_stale( config_folder ):
+    config = Config( str( config_folder.parent ) )
+    config.from_folder( str( config_folder ), cache = True )
+    assert config[ 'COMMON' ] == { 'C': 1 }
+
+    _edit( config_folder / 'inc' / 'common.conf', "C: 42\n" )
+    config = Config( str( config_folder.parent ) )
+    config.from_folder( str( config_folder ), cache = True )
+    assert config[ 'COMMON' ] == { 'C': 42 }
+
+    # A fresh process only has the persistent cache.
+    _parse_cached.cache_clear()
+    config = Config( str( config_folder.parent ) )
+    config.from_folder( str( config_folder ), cache = True )
+    assert config[ 'COMMON' ] == { 'C': 42 }
+
+
+def test_cache_is_disabled_by_default( config_folder ):
+    config = Config( str( config_folder.parent ) )
+    config.from_folder( str( config_folder ) )
+    assert not ( config_folder / '.cache' ).exists()
+
+
+def test_cache_file_is_private_and_replaced( config_folder ):
+    config = Config( str( config_folder.parent ) )
+    config.from_folder( str( config_folder ), cache = True )
+    _edit( config_folder / 'inc' / 'common.conf', "C: 42\n" )
+    config.from_folder( str( config_folder ), cache = True )
+
+    cache_files = list( ( config_folder / '.cache' ).iterdir() )
+    assert len( cache_files ) == 1
+    assert stat.S_IMODE( cache_files[ 0 ].stat().st_mode ) == 0o600
+
+
+def test_untrusted_cache_file_is_ignored( config_folder ):
+    config = Config( str( config_folder.parent ) )
+    config.from_folder( str( config_folder ), cache = True )
+    cache_file, = ( config_folder / '.cache' ).iterdir()
+    # Replace the cache by a valid, but group writable, file; this shall not be unpickled.
+    cache_file.write_bytes( pickle.dumps( { 'depends': [], 'config': { 'LOGGING': {}, 'COMMON': { 'C': 666 } } } ) )
+    cache_file.chmod( 0o664 )
+
+    config = Config( str( config_folder.parent ) )
+    config.from_folder( str( config_folder ), cache = True )
+    assert config[ 'COMMON' ] == { 'C': 1 }
+    assert stat.S_IMODE( cache_file.stat().st_mode ) == 0o600
+
+
+def test_missing_sections_are_reported_on_cache_hit( config_folder, capsys ):
+    config = Config( str( config_folder.parent ) )
+    config.from_folder( str( config_folder ), cache = True )
+    capsys.readouterr()
+
+    config = Config( str( config_folder.parent ) )
+    config.from_folder( str( config_folder ), cache = True )
+    assert "No 'environ' folder for DEVELOPMENT configuration" in capsys.readouterr().err
+
+
+def test_environment_is_read_when_loading( config_folder, monkeypatch ):
+    ( config_folder / 'environ' ).mkdir()
+    ( config_folder / 'environ' / 'PRODUCTION.conf' ).write_text( "NAME: prod\n" )
+    config = Config( str( config_folder.parent ) )
+    monkeypatch.setenv( 'FLASK_ENV', 'PRODUCTION' )
+    config.from_folder( str( config_folder ) )
+    assert config[ 'ENV' ] == 'PRODUCTION'
+    assert config[ 'NAME' ] == 'prod'
+
+
+def test_folder_uses_the_parse_cache( config_folder ):
+    config = Config( str( config_folder.parent ) )
+    config.from_folder( str( config_folder ) )
+    hits = _parse_cached.cache_info().hits
+
+    config = Config( str( config_folder.parent ) )
+    config.from_folder( str( config_folder ) )
+    assert _parse_cached.cache_info().hits > hits
+
+    _edit( config_folder / 'inc' / 'common.conf', "C: 42\n" )
+    config = Config( str( config_folder.parent ) )
+    config.from_folder( str( config_folder ) )
+    assert config[ 'COMMON' ] == { 'C': 42 }
+
+
+def test_override_does_not_leak_into_aliases( config_folder ):
+    ( config_folder / 'environ' ).mkdir()
+    ( config_folder / 'environ' / 'DEVELOPMENT.conf' ).write_text( "DB: &d { HOST: a }\nDB_RO: *d\n" )
+    ( config_folder / 'tasks' ).mkdir()
+    ( config_folder / 'tasks' / 'webapp.conf' ).write_text( "DB: { HOST: b }\n" )
+    config = Config( str( config_folder.parent ) )
+    config.from_folder( str( config_folder ) )
+    assert config[ 'DB' ] == { 'HOST': 'b' }
+    assert config[ 'DB_RO' ] == { 'HOST': 'a' }
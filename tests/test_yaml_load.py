@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+#
+# Flask Extended Config extension for Flask framework
+#
+# Copyright (C) 2018-2025 Marc Bertens-Nguyen <m.bertens@pe2mbs.nl>
+#
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Library General Public License GPL-2.0-only
+# as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+import os
+import builtins
+import pytest
+import yaml
+from flask_extended_config.yaml_load import my_safe_load
+
+
+def _load( filename ):
+    with open( filename, 'r' ) as stream:
+        return my_safe_load( stream )
+
+
+def test_include_aliases_anchor_of_master( tmp_path ):
+    ( tmp_path / 'master.conf' ).write_text( "BASE: &base { X: 1 }\nINC: !include ./inc.conf\n" )
+    ( tmp_path / 'inc.conf' ).write_text( "Y: *base\n" )
+    assert _load( tmp_path / 'master.conf' ) == { 'BASE': { 'X': 1 }, 'INC': { 'Y': { 'X': 1 } } }
+
+
+def test_diamond_include_returns_independent_copies( tmp_path ):
+    ( tmp_path / 'master.conf' ).write_text( "A: !include ./a.conf\nB: !include ./b.conf\n" )
+    ( tmp_path / 'a.conf' ).write_text( "SHARED: !include ./shared.conf\n" )
+    ( tmp_path / 'b.conf' ).write_text( "SHARED: !include ./shared.conf\n" )
+    ( tmp_path / 'shared.conf' ).write_text( "X: { Y: 1 }\n" )
+    data = _load( tmp_path / 'master.conf' )
+    assert data[ 'A' ] == data[ 'B' ] == { 'SHARED': { 'X': { 'Y': 1 } } }
+
+    data[ 'A' ][ 'SHARED' ][ 'X' ][ 'Y' ] = 2
+    assert data[ 'B' ][ 'SHARED' ][ 'X' ][ 'Y' ] == 1
+
+
+def test_recursive_include_raises( tmp_path ):
+    ( tmp_path / 'master.conf' ).write_text( "SELF: !include ./master.conf\n" )
+    with pytest.raises( yaml.constructor.ConstructorError, match = 'recursive' ):
+        _load( tmp_path / 'master.conf' )
+
+
+def test_files_are_read_once_per_parse( tmp_path, monkeypatch ):
+    ( tmp_path / 'master.conf' ).write_text( "A: !include ./a.conf\nB: !include ./a.conf\n" )
+    ( tmp_path / 'a.conf' ).write_text( "X: 1\n" )
+    stream = open( tmp_path / 'master.conf', 'r' )
+    opened = []
+    real_open = open
+
+    def counting_open( filename, *args, **kwargs ):
+        opened.append( os.path.basename( filename ) )
+        return real_open( filename, *args, **kwargs )
+
+    monkeypatch.setattr( builtins, 'open', counting_open )
+    with stream:
+        assert my_safe_load( stream ) == { 'A': { 'X': 1 }, 'B': { 'X': 1 } }
+
+    assert opened == [ 'a.conf' ]